@@ -11,169 +11,689 @@
 """
 
 import json
+import logging
+import mmap
 import os
-from typing import List, Dict, Any, Optional
+import re
+import sys
+import types
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Dict, Any, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# 可选依赖：orjson，JSON 解析/序列化加速
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 可选依赖：pyahocorasick，用于多关键词匹配加速
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# 可选依赖：ijson，用于流式解析大配置文件
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# 可选依赖：pandas，用于大批量新闻的向量化匹配
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# 配置文件超过该大小时改用流式解析，避免一次性构建完整字典树
+STREAM_PARSE_THRESHOLD = 256 * 1024
+
+# 新闻条数超过该值时走 pandas 向量化匹配（每个模式一次 C 层扫描）
+VECTORIZE_THRESHOLD = 200
+
+# 未配置 ai_search 时的默认 AI 搜索配置（只读，所有订阅共享）
+_DEFAULT_AI_CFG = types.MappingProxyType({
+    "enabled": False,
+    "trigger_threshold": 3,
+    "search_keywords": [],
+    "time_range_hours": 24,
+    "max_results": 15,
+})
+
+
+class _CompiledMatcher:
+    """
+    订阅关键词的预编译匹配器
+
+    在构建时一次性完成关键词小写化、Aho-Corasick 自动机（可用时）或
+    正则 alternation 的编译，之后每次 filter 调用只剩下紧凑的扫描循环。
+    实例缓存在订阅字典的 __matcher__ 键上，配置重载时随字典一起丢弃。
+    """
+
+    __slots__ = (
+        "normal_kws", "required_kws", "excluded_kws", "limit",
+        "normal_l", "required_l", "excluded_l", "has_norm", "has_req",
+        "automaton", "required_full", "norm_re", "excl_re",
+    )
+
+    def __init__(self, keywords: Dict):
+        """
+        Args:
+            keywords: 订阅的 keywords 配置字典
+        """
+        self.normal_kws = keywords.get("normal", [])
+        self.required_kws = keywords.get("required", [])
+        self.excluded_kws = keywords.get("excluded", [])
+        self.limit = keywords.get("limit", 0)
+
+        # 预先小写化关键词，匹配时不再逐条调用 .lower()
+        self.normal_l = tuple(k.lower() for k in self.normal_kws)
+        self.required_l = tuple(k.lower() for k in self.required_kws)
+        self.excluded_l = tuple(k.lower() for k in self.excluded_kws)
+        self.has_norm = bool(self.normal_l)
+        self.has_req = bool(self.required_l)
+        self.required_full = (1 << len(self.required_l)) - 1
+
+        self.automaton = self._build_automaton()
+        if self.automaton is None:
+            # 过滤词/普通词均为 OR 逻辑，合并为忽略大小写的 alternation
+            self.excl_re = (
+                re.compile("|".join(re.escape(k) for k in self.excluded_kws), re.IGNORECASE)
+                if self.excluded_kws else None
+            )
+            self.norm_re = (
+                re.compile("|".join(re.escape(k) for k in self.normal_kws), re.IGNORECASE)
+                if self.normal_kws else None
+            )
+        else:
+            self.excl_re = None
+            self.norm_re = None
+
+    def _build_automaton(self) -> Optional[Any]:
+        """构建覆盖所有关键词的 Aho-Corasick 自动机，不可用时返回 None"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+
+        if not (self.normal_l or self.required_l or self.excluded_l):
+            return None
+
+        # 同一个词可能同时出现在多个类别中，payload 合并为列表
+        word_tags: Dict[str, list] = {}
+        for idx, kw in enumerate(self.normal_l):
+            word_tags.setdefault(kw, []).append(("n", idx))
+        for idx, kw in enumerate(self.required_l):
+            word_tags.setdefault(kw, []).append(("r", idx))
+        for idx, kw in enumerate(self.excluded_l):
+            word_tags.setdefault(kw, []).append(("e", idx))
+
+        # 空字符串关键词在基线语义下匹配任意标题，但 add_word 会静默丢弃
+        # 空键，语义就变了；回退到逐词扫描路径保持原行为
+        if any(not word for word in word_tags):
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for word, tags in word_tags.items():
+            automaton.add_word(word, tags)
+
+        # 一个词都没加进去就不是合法自动机，iter() 会直接报错
+        if len(automaton) == 0:
+            return None
+
+        automaton.make_automaton()
+        return automaton
+
+    def filter(self, news_data: List[Dict]) -> List[Dict]:
+        """
+        筛选匹配的新闻
+
+        匹配规则：
+        1. 排除词优先（黑名单）
+        2. 普通关键词（OR逻辑，至少匹配一个）
+        3. 必须词（AND逻辑，必须全部匹配）
+        4. 应用数量限制
+
+        Args:
+            news_data: 新闻数据列表
+
+        Returns:
+            匹配的新闻列表
+        """
+        if self.automaton is None and PANDAS_AVAILABLE and len(news_data) > VECTORIZE_THRESHOLD:
+            return self._apply_limit(self._filter_vectorized(news_data))
+
+        # 小写标题按需惰性生成，数量限制提前终止时不浪费
+        titles_lower = (n.get("title", "").lower() for n in news_data)
+        return self._scan(news_data, titles_lower)
+
+    def filter_prepared(self, news_data: List[Dict], titles_lower: List[str]) -> List[Dict]:
+        """
+        用预先小写化的标题筛选匹配的新闻
+
+        供 match_news_for_all 在多个订阅间复用同一份小写标题，
+        避免每个订阅重复调用 str.lower。规则与 filter 一致。
+
+        Args:
+            news_data: 新闻数据列表
+            titles_lower: 与 news_data 等长的小写标题列表
+
+        Returns:
+            匹配的新闻列表
+        """
+        if self.automaton is None and PANDAS_AVAILABLE and len(news_data) > VECTORIZE_THRESHOLD:
+            return self._apply_limit(self._filter_vectorized(news_data))
+
+        return self._scan(news_data, titles_lower)
+
+    def _apply_limit(self, matched_news: List[Dict]) -> List[Dict]:
+        """数量限制兜底（向量化路径整列计算后在此截断）"""
+        if self.limit > 0 and len(matched_news) > self.limit:
+            matched_news = matched_news[:self.limit]
+            logger.debug("   [警告] 结果超过限制，截取前 %s 条", self.limit)
+        return matched_news
+
+    def _scan(self, news_data: List[Dict], titles_lower) -> List[Dict]:
+        """
+        逐条扫描 (新闻, 小写标题) 并应用匹配规则
+
+        Args:
+            news_data: 新闻数据列表
+            titles_lower: 小写标题的列表或生成器
+
+        Returns:
+            匹配的新闻列表
+        """
+        limit = self.limit
+        has_norm = self.has_norm
+        has_req = self.has_req
+
+        if self.automaton is not None:
+            # 自动机路径：一次扫描完成所有关键词匹配
+            matched_news = []
+            append_matched = matched_news.append
+            required_full = self.required_full
+            ac_iter = self.automaton.iter
+
+            for news, title in zip(news_data, titles_lower):
+                has_normal = False
+                seen_required = 0
+                excluded_hit = False
+
+                for _, tags in ac_iter(title):
+                    for tag, idx in tags:
+                        if tag == "e":
+                            # 规则1: 命中过滤词，立即放弃该新闻
+                            excluded_hit = True
+                            break
+                        elif tag == "r":
+                            seen_required |= 1 << idx
+                        else:
+                            has_normal = True
+                    if excluded_hit:
+                        break
+
+                if excluded_hit:
+                    continue
+                # 规则2: 普通关键词至少匹配一个
+                if has_norm and not has_normal:
+                    continue
+                # 规则3: 必须词必须全部匹配
+                if seen_required != required_full:
+                    continue
+
+                append_matched(news)
+
+                # 规则4: 达到数量限制即提前终止，跳过剩余新闻
+                if limit and len(matched_news) >= limit:
+                    break
+
+        else:
+            # 回退路径：预编译正则扫描（IGNORECASE，小写标题上结果一致）
+            matched_news = []
+            append_matched = matched_news.append
+            required_l = self.required_l
+            excl_search = self.excl_re.search if self.excl_re is not None else None
+            norm_search = self.norm_re.search if self.norm_re is not None else None
+
+            for news, title in zip(news_data, titles_lower):
+                # 规则1: 检查过滤词（优先级最高）
+                if excl_search is not None and excl_search(title):
+                    continue
+
+                # 规则2: 检查普通关键词（至少匹配一个）
+                if norm_search is not None and not norm_search(title):
+                    continue
+
+                # 规则3: 检查必须词（必须全部匹配）
+                if has_req:
+                    if not all(req in title for req in required_l):
+                        continue
+
+                # 通过所有规则，添加到结果
+                append_matched(news)
+
+                # 规则4: 达到数量限制即提前终止，跳过剩余新闻
+                if limit and len(matched_news) >= limit:
+                    break
+
+        return matched_news
+
+    def _filter_vectorized(self, news_data: List[Dict]) -> List[Dict]:
+        """
+        pandas 向量化匹配大批量新闻
+
+        把标题提升为 Series 后，过滤词/普通词各做一次整列
+        str.contains 扫描，必须词逐个与掩码求与，避免逐行 Python 循环。
+
+        Args:
+            news_data: 新闻数据列表
+
+        Returns:
+            匹配的新闻列表（保持原顺序）
+        """
+        titles = pd.Series([n.get("title", "") for n in news_data], dtype=object)
+        mask = pd.Series(True, index=titles.index)
+
+        # 规则1: 过滤词（黑名单）
+        if self.excluded_kws:
+            excl_pat = "|".join(re.escape(k) for k in self.excluded_kws)
+            mask &= ~titles.str.contains(excl_pat, case=False, regex=True, na=False)
+
+        # 规则2: 普通关键词（OR逻辑）
+        if self.normal_kws:
+            norm_pat = "|".join(re.escape(k) for k in self.normal_kws)
+            mask &= titles.str.contains(norm_pat, case=False, regex=True, na=False)
+
+        # 规则3: 必须词（AND逻辑）
+        for req in self.required_kws:
+            mask &= titles.str.contains(re.escape(req), case=False, regex=True, na=False)
+
+        return [news for news, ok in zip(news_data, mask.to_numpy()) if ok]
+
+
+# Subscription.get 中私有缓存键到属性名的映射
+_SUB_KEY_ALIASES = {
+    "__matcher__": "matcher",
+    "__valid_webhooks__": "valid_webhooks",
+    "__ai_cfg__": "ai_cfg",
+}
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class Subscription:
+    """
+    订阅配置的轻量对象
+
+    用 __slots__ 数据类替代嵌套字典：省去每个订阅约 200 字节的
+    dict 头开销，属性访问走槽位索引而非逐键哈希查找。
+    仍提供 get/[] 的字典式读取，兼容按原始键访问的既有调用方。
+    """
+
+    id: Optional[str]
+    name: Optional[str]
+    enabled: bool
+    keywords: Dict
+    webhooks: List[Dict]
+    ai_search: Dict
+    normal: tuple
+    required: tuple
+    excluded: tuple
+    limit: int
+    raw: Dict = field(repr=False)
+    matcher: Optional[_CompiledMatcher] = field(default=None, repr=False)
+    valid_webhooks: Optional[List[Dict]] = field(default=None, repr=False)
+    ai_cfg: Optional[Dict] = field(default=None, repr=False)
+
+    _KEY_ALIASES: ClassVar[Dict[str, str]] = _SUB_KEY_ALIASES
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> "Subscription":
+        """从原始配置字典构建订阅对象"""
+        keywords = raw.get("keywords") or {}
+        return cls(
+            id=raw.get("id"),
+            name=raw.get("name"),
+            enabled=raw.get("enabled", True),
+            keywords=keywords,
+            webhooks=raw.get("webhooks", []),
+            ai_search=raw.get("ai_search", {}),
+            normal=tuple(keywords.get("normal", [])),
+            required=tuple(keywords.get("required", [])),
+            excluded=tuple(keywords.get("excluded", [])),
+            limit=keywords.get("limit", 0),
+            raw=raw,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """字典式读取：已提升为属性的键走槽位，其余回退到原始字典"""
+        try:
+            value = getattr(self, self._KEY_ALIASES.get(key, key))
+        except AttributeError:
+            return self.raw.get(key, default)
+        if value is None:
+            return self.raw.get(key, default)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, self._KEY_ALIASES.get(key, key), value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
 
 class SubscriptionManager:
     """订阅管理器"""
     
-    def __init__(self, config_path: str = "config/subscriptions.json"):
+    def __init__(self, config_path: str = "config/subscriptions.json", verbose: bool = False):
         """
         初始化订阅管理器
-        
+
         Args:
             config_path: 订阅配置文件路径
+            verbose: 是否输出匹配过程的调试日志
         """
+        # 只在显式要求时调低级别；默认保持 NOTSET，沿用应用的日志配置
+        if verbose:
+            logger.setLevel(logging.DEBUG)
         self.config_path = config_path
         self.config_data = {}
         self.subscriptions = []
         self.global_settings = {}
+        # 配置版本号：每次重新加载递增，用于失效下面的结果缓存
+        self._version = 0
+        self._active_cache = None
+        self._active_cache_version = -1
+        self._stats_cache = None
+        self._stats_cache_version = -1
+        self._validated = None
+        self._validated_version = -1
+        self._id_index = {}
         self._load_config()
     
     def _load_config(self):
         """加载订阅配置文件"""
-        if not os.path.exists(self.config_path):
-            print(f"[警告] 订阅配置文件不存在: {self.config_path}")
-            print("   将使用默认配置模式")
+        self._version += 1
+
+        # 直接打开并处理 FileNotFoundError：省一次 stat() 且无 检查-打开 竞态
+        try:
+            config_file = open(self.config_path, 'rb')
+        except FileNotFoundError:
+            logger.warning("[警告] 订阅配置文件不存在: %s，将使用默认配置模式", self.config_path)
             return
-        
+
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config_data = json.load(f)
-                self.subscriptions = self.config_data.get("subscriptions", [])
-                self.global_settings = self.config_data.get("global_settings", {})
-                
-                print(f"[OK] 成功加载订阅配置")
-                print(f"   版本: {self.config_data.get('version', '未知')}")
-                print(f"   订阅数量: {len(self.subscriptions)}")
-                
+            streaming = False
+            with config_file:
+                file_size = os.fstat(config_file.fileno()).st_size
+
+                if IJSON_AVAILABLE and file_size >= STREAM_PARSE_THRESHOLD:
+                    streaming = True
+                else:
+                    # mmap 后整体解析字节串，跳过文本模式的增量解码包装层
+                    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+                    if file_size > 0:
+                        mm = mmap.mmap(config_file.fileno(), 0, access=mmap.ACCESS_READ)
+                        try:
+                            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                                mm.madvise(mmap.MADV_SEQUENTIAL)
+                                mm.madvise(mmap.MADV_WILLNEED)
+                            self.config_data = loads(mm[:])
+                        finally:
+                            mm.close()
+                    else:
+                        self.config_data = loads(config_file.read())
+
+            if streaming:
+                self._load_config_streaming()
+
+            raw_subs = self.config_data.get("subscriptions", [])
+            self.global_settings = self.config_data.get("global_settings", {})
+
+            # 合并重复字符串，降低大配置的内存占用
+            self._intern_strings(raw_subs)
+
+            # 转为 __slots__ 数据类，热路径用属性访问替代逐键哈希查找
+            self.subscriptions = [Subscription.from_dict(raw) for raw in raw_subs]
+
+            # 建立 ID 索引，使按 ID 查找为 O(1)
+            self._id_index = {
+                sub.id: sub for sub in self.subscriptions if sub.id
+            }
+
+            # 预先过滤无效 webhook、组装 AI 搜索配置、编译匹配器，热路径直接读取
+            for sub in self.subscriptions:
+                sub.valid_webhooks = self._filter_webhooks(sub)
+                sub.ai_cfg = self._build_ai_search_config(sub)
+                sub.matcher = _CompiledMatcher(sub.keywords)
+
+            logger.info(
+                "[OK] 成功加载订阅配置 (版本: %s, 订阅数量: %s)",
+                self.config_data.get("version", "未知"),
+                len(self.subscriptions),
+            )
+
         except json.JSONDecodeError as e:
-            print(f"[错误] 订阅配置文件JSON格式错误: {e}")
+            logger.error("[错误] 订阅配置文件JSON格式错误: %s", e)
             raise
         except Exception as e:
-            print(f"[错误] 加载订阅配置失败: {e}")
+            logger.error("[错误] 加载订阅配置失败: %s", e)
             raise
-    
+
+    def _load_config_streaming(self):
+        """
+        流式解析大配置文件
+
+        使用 ijson 逐条读取订阅，峰值内存只与单个订阅对象成正比，
+        而不是整个配置文件的字典树。
+        """
+        # use_float=True：ijson 默认把 JSON 浮点数解析成 Decimal，
+        # 会让后续 json/orjson 导出失败，这里保持与 json.load 一致
+        with open(self.config_path, 'rb') as f:
+            subscriptions = list(ijson.items(f, 'subscriptions.item', use_float=True))
+
+        with open(self.config_path, 'rb') as f:
+            global_settings = dict(ijson.kvitems(f, 'global_settings', use_float=True))
+
+        with open(self.config_path, 'rb') as f:
+            version = next(ijson.items(f, 'version', use_float=True), None)
+
+        # 只重建实际用到的字段，不保留完整文档
+        self.config_data = {
+            "version": version,
+            "subscriptions": subscriptions,
+            "global_settings": global_settings,
+        }
+
+    def _intern_strings(self, raw_subscriptions: List[Dict]):
+        """
+        内部化订阅中重复出现的字符串
+
+        不同订阅经常共用相同的关键词和 webhook 名称/类型，JSON 解析会
+        为每次出现分配新的 str 对象。sys.intern 将它们合并为单个堆对象，
+        既省内存，也让匹配循环中的相等比较先走指针快路径。
+
+        Args:
+            raw_subscriptions: 解析出的原始订阅字典列表
+        """
+        for sub in raw_subscriptions:
+            keywords = sub.get("keywords")
+            if isinstance(keywords, dict):
+                for field in ("normal", "required", "excluded"):
+                    kws = keywords.get(field)
+                    if kws:
+                        keywords[field] = [sys.intern(k) for k in kws]
+
+            for webhook in sub.get("webhooks", []):
+                for field in ("name", "type"):
+                    value = webhook.get(field)
+                    if isinstance(value, str):
+                        webhook[field] = sys.intern(value)
+
     def has_subscriptions(self) -> bool:
         """检查是否有订阅配置"""
         return len(self.subscriptions) > 0
     
-    def get_active_subscriptions(self) -> List[Dict]:
+    def get_active_subscriptions(self) -> List[Subscription]:
         """
         获取所有启用的订阅
-        
+
+        结果按配置版本缓存，重新加载配置后自动失效。
+
         Returns:
             启用的订阅列表
         """
-        active = [sub for sub in self.subscriptions if sub.get("enabled", True)]
-        print(f"[信息] 活跃订阅: {len(active)}/{len(self.subscriptions)}")
+        if self._active_cache_version == self._version:
+            return self._active_cache
+
+        active = [sub for sub in self.subscriptions if sub.enabled]
+        self._active_cache = active
+        self._active_cache_version = self._version
         return active
+
+    def log_active(self):
+        """输出活跃订阅比例"""
+        active = self.get_active_subscriptions()
+        logger.info("[信息] 活跃订阅: %s/%s", len(active), len(self.subscriptions))
     
-    def get_subscription_by_id(self, sub_id: str) -> Optional[Dict]:
+    def get_subscription_by_id(self, sub_id: str) -> Optional[Subscription]:
         """
         根据ID获取订阅
-        
+
         Args:
             sub_id: 订阅ID
-            
+
         Returns:
-            订阅配置字典，未找到返回None
+            订阅对象，未找到返回None
         """
-        for sub in self.subscriptions:
-            if sub.get("id") == sub_id:
-                return sub
-        return None
+        return self._id_index.get(sub_id)
     
+    def _get_matcher(self, subscription: Dict) -> "_CompiledMatcher":
+        """
+        获取（或惰性构建）订阅的预编译匹配器
+
+        Args:
+            subscription: 订阅配置
+
+        Returns:
+            预编译匹配器实例
+        """
+        matcher = subscription.get("__matcher__")
+        if matcher is None:
+            matcher = _CompiledMatcher(subscription.get("keywords", {}))
+            subscription["__matcher__"] = matcher
+        return matcher
+
     def match_news_for_subscription(
-        self, 
-        subscription: Dict, 
+        self,
+        subscription: Dict,
         news_data: List[Dict]
     ) -> List[Dict]:
         """
         为特定订阅筛选匹配的新闻
-        
+
         匹配规则：
         1. 排除词优先（黑名单）
         2. 普通关键词（OR逻辑，至少匹配一个）
         3. 必须词（AND逻辑，必须全部匹配）
         4. 应用数量限制
-        
+
+        关键词的小写化和匹配器编译只在首次调用时发生，之后复用
+        缓存的 _CompiledMatcher。
+
         Args:
             subscription: 订阅配置
             news_data: 新闻数据列表
-            
+
         Returns:
             匹配的新闻列表
         """
-        sub_name = subscription.get("name", "未命名订阅")
-        keywords = subscription.get("keywords", {})
-        
-        normal_kws = keywords.get("normal", [])
-        required_kws = keywords.get("required", [])
-        excluded_kws = keywords.get("excluded", [])
-        limit = keywords.get("limit", 0)
-        
-        print(f"\n[匹配] [{sub_name}] 开始匹配新闻...")
-        print(f"   普通关键词: {normal_kws}")
-        print(f"   必须包含: {required_kws}")
-        print(f"   排除词: {excluded_kws}")
-        print(f"   数量限制: {limit if limit > 0 else '不限制'}")
-        
-        matched_news = []
-        
-        for news in news_data:
-            title = news.get("title", "").lower()
-            
-            # 规则1: 检查过滤词（优先级最高）
-            if excluded_kws:
-                if any(ex.lower() in title for ex in excluded_kws):
-                    continue
-            
-            # 规则2: 检查普通关键词（至少匹配一个）
-            if normal_kws:
-                if not any(kw.lower() in title for kw in normal_kws):
-                    continue
-            
-            # 规则3: 检查必须词（必须全部匹配）
-            if required_kws:
-                if not all(req.lower() in title for req in required_kws):
-                    continue
-            
-            # 通过所有规则，添加到结果
-            matched_news.append(news)
-        
-        # 规则4: 应用数量限制
-        if limit > 0 and len(matched_news) > limit:
-            matched_news = matched_news[:limit]
-            print(f"   [警告] 结果超过限制，截取前 {limit} 条")
-        
-        print(f"   [OK] 匹配到 {len(matched_news)} 条新闻")
-        
+        matcher = self._get_matcher(subscription)
+
+        logger.debug("[匹配] [%s] 开始匹配新闻...", subscription.get("name", "未命名订阅"))
+        logger.debug("   普通关键词: %s", matcher.normal_kws)
+        logger.debug("   必须包含: %s", matcher.required_kws)
+        logger.debug("   排除词: %s", matcher.excluded_kws)
+        logger.debug("   数量限制: %s", matcher.limit if matcher.limit > 0 else "不限制")
+
+        matched_news = matcher.filter(news_data)
+
+        logger.debug("   [OK] 匹配到 %s 条新闻", len(matched_news))
+
         return matched_news
-    
-    def get_webhooks(self, subscription: Dict) -> List[Dict]:
+
+    def match_news_for_all(self, news_data: List[Dict]) -> Dict[str, List[Dict]]:
         """
-        获取订阅的所有webhook配置
-        
+        一次遍历为所有活跃订阅匹配新闻
+
+        标题只小写化一次，所有订阅的匹配器共享同一份小写标题，
+        S 个订阅处理 N 条新闻时省去 (S-1)·N 次 str.lower 调用。
+
+        Args:
+            news_data: 新闻数据列表
+
+        Returns:
+            {订阅ID: 匹配的新闻列表}
+        """
+        titles_lower = [n.get("title", "").lower() for n in news_data]
+
+        results = {}
+        for idx, sub in enumerate(self.get_active_subscriptions(), 1):
+            sub_id = sub.get("id") or f"sub_{idx}"
+            matcher = self._get_matcher(sub)
+            results[sub_id] = matcher.filter_prepared(news_data, titles_lower)
+            logger.debug("[匹配] [%s] 匹配到 %s 条新闻", sub_id, len(results[sub_id]))
+
+        return results
+
+    def _filter_webhooks(self, subscription: Dict) -> List[Dict]:
+        """
+        过滤订阅中缺少 url 的无效 webhook
+
         Args:
             subscription: 订阅配置
-            
+
         Returns:
-            webhook列表
+            有效的webhook列表
         """
-        webhooks = subscription.get("webhooks", [])
-        
-        # 验证webhook配置
         valid_webhooks = []
-        for webhook in webhooks:
+        for webhook in subscription.get("webhooks", []):
             if not webhook.get("url"):
-                print(f"   [警告] 跳过无效webhook: {webhook.get('name', '未命名')}")
+                logger.warning("   [警告] 跳过无效webhook: %s", webhook.get("name", "未命名"))
                 continue
             valid_webhooks.append(webhook)
-        
         return valid_webhooks
+
+    def get_webhooks(self, subscription: Dict) -> List[Dict]:
+        """
+        获取订阅的所有webhook配置
+
+        加载配置时已预先完成验证，这里直接返回缓存的有效列表。
+
+        Args:
+            subscription: 订阅配置
+
+        Returns:
+            webhook列表
+        """
+        valid_webhooks = subscription.get("__valid_webhooks__")
+        if valid_webhooks is not None:
+            return valid_webhooks
+
+        # 未经 _load_config 处理的订阅字典，现场过滤
+        return self._filter_webhooks(subscription)
     
     def should_enable_ai_search(self, subscription: Dict, matched_count: int) -> bool:
         """
@@ -194,30 +714,30 @@ class SubscriptionManager:
         threshold = ai_config.get("trigger_threshold", 3)
         
         if matched_count < threshold:
-            print(f"   [AI] 匹配数 ({matched_count}) < 阈值 ({threshold})，触发AI搜索")
+            logger.debug("   [AI] 匹配数 (%s) < 阈值 (%s)，触发AI搜索", matched_count, threshold)
             return True
         
         return False
     
-    def get_ai_search_config(self, subscription: Dict) -> Dict:
+    def _build_ai_search_config(self, subscription: Dict) -> Dict:
         """
-        获取订阅的AI搜索配置
-        
+        组装订阅的AI搜索配置字典
+
         Args:
             subscription: 订阅配置
-            
+
         Returns:
             AI搜索配置字典
         """
         ai_config = subscription.get("ai_search", {})
         keywords = subscription.get("keywords", {})
-        
+
         # 如果有自定义搜索关键词，使用自定义的
         search_keywords = ai_config.get("search_keywords")
         if not search_keywords:
             # 否则使用普通关键词
             search_keywords = keywords.get("normal", [])
-        
+
         return {
             "enabled": ai_config.get("enabled", False),
             "trigger_threshold": ai_config.get("trigger_threshold", 3),
@@ -225,75 +745,145 @@ class SubscriptionManager:
             "time_range_hours": ai_config.get("time_range_hours", 24),
             "max_results": ai_config.get("max_results", 15)
         }
+
+    def get_ai_search_config(self, subscription: Dict) -> Dict:
+        """
+        获取订阅的AI搜索配置
+
+        加载配置时已预先组装，这里直接返回缓存的字典。
+
+        Args:
+            subscription: 订阅配置
+
+        Returns:
+            AI搜索配置字典
+        """
+        ai_cfg = subscription.get("__ai_cfg__")
+        if ai_cfg is not None:
+            return ai_cfg
+
+        # 未经 _load_config 处理的订阅字典，现场组装
+        if "ai_search" in subscription or "keywords" in subscription:
+            return self._build_ai_search_config(subscription)
+
+        return _DEFAULT_AI_CFG
     
     def get_global_settings(self) -> Dict:
         """获取全局设置"""
         return self.global_settings
     
+    def _exportable_config(self) -> Dict:
+        """构建可导出的配置副本，剥离订阅上缓存的 __xx__ 私有键"""
+        data = dict(self.config_data)
+        subs = data.get("subscriptions")
+        if subs:
+            data["subscriptions"] = [
+                {k: v for k, v in sub.items() if not k.startswith("__")}
+                for sub in subs
+            ]
+        return data
+
     def export_config(self, output_path: str):
         """
         导出配置到文件
-        
+
+        先写入同目录的临时文件，fsync 后原子重命名到目标路径，
+        进程中途退出也不会留下半截配置。
+
         Args:
             output_path: 输出文件路径
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, ensure_ascii=False, indent=2)
-            print(f"[OK] 配置已导出到: {output_path}")
+            config_data = self._exportable_config()
+            if ORJSON_AVAILABLE:
+                # orjson 直接产出 UTF-8 字节（默认即 ensure_ascii=False 行为）
+                payload = orjson.dumps(
+                    config_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                payload = json.dumps(
+                    config_data, ensure_ascii=False, indent=2
+                ).encode('utf-8')
+
+            tmp_path = output_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, output_path)
+
+            logger.info("[OK] 配置已导出到: %s", output_path)
         except Exception as e:
-            print(f"[错误] 导出配置失败: {e}")
+            logger.error("[错误] 导出配置失败: %s", e)
     
-    def validate_config(self) -> bool:
+    def validate_config(self, fail_fast: bool = False) -> bool:
         """
         验证配置文件的有效性
-        
+
+        验证结果按配置版本缓存，重新加载配置后自动失效。
+
+        Args:
+            fail_fast: 为 True 时遇到第一个错误立即返回，不再收集全部错误
+
         Returns:
             配置是否有效
         """
+        if self._validated_version == self._version:
+            return self._validated
+
         if not self.subscriptions:
-            print("[警告] 没有配置任何订阅")
-            return False
-        
+            logger.warning("[警告] 没有配置任何订阅")
+            return self._cache_validated(False)
+
         errors = []
-        
+        required_fields = ("name", "keywords", "webhooks")
+
         for idx, sub in enumerate(self.subscriptions, 1):
-            sub_id = sub.get("id", f"订阅{idx}")
-            
+            sub_id = sub.id or f"订阅{idx}"
+
             # 检查必需字段
-            if not sub.get("name"):
-                errors.append(f"[{sub_id}] 缺少 name 字段")
-            
-            if not sub.get("keywords"):
-                errors.append(f"[{sub_id}] 缺少 keywords 字段")
-            
-            if not sub.get("webhooks"):
-                errors.append(f"[{sub_id}] 缺少 webhooks 字段")
-            else:
-                webhooks = sub.get("webhooks", [])
-                if not webhooks:
-                    errors.append(f"[{sub_id}] webhooks 列表为空")
-                else:
-                    for w_idx, webhook in enumerate(webhooks, 1):
-                        if not webhook.get("url"):
-                            errors.append(f"[{sub_id}] webhook[{w_idx}] 缺少 url")
-        
+            for field_name in required_fields:
+                if not getattr(sub, field_name):
+                    if fail_fast:
+                        logger.error("[错误] [%s] 缺少 %s 字段", sub_id, field_name)
+                        return self._cache_validated(False)
+                    errors.append(f"[{sub_id}] 缺少 {field_name} 字段")
+
+            for w_idx, webhook in enumerate(sub.webhooks, 1):
+                if not webhook.get("url"):
+                    if fail_fast:
+                        logger.error("[错误] [%s] webhook[%s] 缺少 url", sub_id, w_idx)
+                        return self._cache_validated(False)
+                    errors.append(f"[{sub_id}] webhook[{w_idx}] 缺少 url")
+
         if errors:
-            print("[错误] 配置验证失败:")
+            logger.error("[错误] 配置验证失败:")
             for error in errors:
-                print(f"   - {error}")
-            return False
-        
-        print("[OK] 配置验证通过")
-        return True
+                logger.error("   - %s", error)
+            return self._cache_validated(False)
+
+        logger.info("[OK] 配置验证通过")
+        return self._cache_validated(True)
+
+    def _cache_validated(self, result: bool) -> bool:
+        """缓存验证结果并返回"""
+        self._validated = result
+        self._validated_version = self._version
+        return result
     
     def get_statistics(self) -> Dict:
         """
         获取订阅统计信息
-        
+
+        结果按配置版本缓存，重新加载配置后自动失效。
+
         Returns:
             统计信息字典
         """
+        if self._stats_cache_version == self._version:
+            return self._stats_cache
+
         total = len(self.subscriptions)
         active = len(self.get_active_subscriptions())
         
@@ -301,17 +891,20 @@ class SubscriptionManager:
         ai_enabled_count = 0
         
         for sub in self.subscriptions:
-            webhook_count += len(sub.get("webhooks", []))
-            if sub.get("ai_search", {}).get("enabled", False):
+            webhook_count += len(sub.webhooks)
+            if sub.ai_search.get("enabled", False):
                 ai_enabled_count += 1
         
-        return {
+        stats = {
             "total_subscriptions": total,
             "active_subscriptions": active,
             "total_webhooks": webhook_count,
             "ai_enabled_count": ai_enabled_count,
             "config_version": self.config_data.get("version", "未知")
         }
+        self._stats_cache = stats
+        self._stats_cache_version = self._version
+        return stats
 
 
 # ==================== 辅助函数 ====================
@@ -374,6 +967,8 @@ def create_sample_config(output_path: str = "config/subscriptions_sample.json"):
 
 if __name__ == "__main__":
     # 测试代码
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("订阅管理模块测试\n")
     
     # 创建示例配置
@@ -0,0 +1,124 @@
+# coding=utf-8
+
+"""
+Gemini 模型可用性测试脚本
+并发探测各个 Gemini 模型，帮助选择 config.yaml 中 gemini_model 的取值
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 候选模型列表（按推荐顺序）
+MODELS_TO_TEST = [
+    "gemini-1.5-flash",
+    "gemini-1.5-flash-8b",
+    "gemini-1.5-pro",
+    "gemini-2.0-flash",
+    "gemini-2.0-flash-lite",
+    "gemini-2.5-flash",
+    "gemini-2.5-flash-lite",
+    "gemini-2.5-pro",
+    "gemini-pro",
+]
+
+TEST_PROMPT = "请用一句话回复：你好"
+
+# 保证并发输出不交错
+_print_lock = threading.Lock()
+
+
+def probe_model(model_name):
+    """
+    探测单个模型是否可用
+
+    Args:
+        model_name: 模型名称
+
+    Returns:
+        (模型名称, 状态, 响应摘要或错误信息)
+    """
+    import google.generativeai as genai
+
+    try:
+        model = genai.GenerativeModel(model_name)
+        response = model.generate_content(TEST_PROMPT)
+        snippet = response.text.strip().replace("\n", " ")[:50]
+        return (model_name, "ok", snippet)
+    except Exception as e:
+        return (model_name, "error", str(e)[:100])
+
+
+def test_gemini_models():
+    """并发测试所有候选模型"""
+
+    print("=" * 60)
+    print("Gemini 模型可用性测试")
+    print("=" * 60 + "\n")
+
+    gemini_key = os.environ.get("GEMINI_API_KEY", "")
+
+    if not gemini_key:
+        print("❌ 错误：未设置 GEMINI_API_KEY 环境变量")
+        print("\n请先设置环境变量：")
+        print("  Windows: set GEMINI_API_KEY=你的密钥")
+        print("  Linux/Mac: export GEMINI_API_KEY=你的密钥")
+        return False
+
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        print("❌ 错误：未安装 google-generativeai")
+        print("\n请先安装依赖：")
+        print("  pip install -r requirements.txt")
+        return False
+
+    genai.configure(api_key=gemini_key)
+
+    print(f"开始并发探测 {len(MODELS_TO_TEST)} 个模型...\n")
+
+    available = []
+
+    # 每个探测都是独立的网络请求，用线程池并发执行
+    # 总耗时从各请求延迟之和降为最慢一个请求的延迟
+    with ThreadPoolExecutor(max_workers=len(MODELS_TO_TEST)) as executor:
+        futures = [executor.submit(probe_model, m) for m in MODELS_TO_TEST]
+
+        for future in as_completed(futures):
+            model_name, status, detail = future.result()
+            with _print_lock:
+                if status == "ok":
+                    print(f"✅ {model_name}")
+                    print(f"   响应：{detail}")
+                    available.append(model_name)
+                else:
+                    print(f"❌ {model_name}")
+                    print(f"   错误：{detail}")
+                print()
+
+    # as_completed 按响应快慢返回，汇总前恢复推荐顺序
+    available.sort(key=MODELS_TO_TEST.index)
+
+    print("=" * 60)
+    if available:
+        print(f"✅ 共 {len(available)}/{len(MODELS_TO_TEST)} 个模型可用：")
+        for name in available:
+            print(f"  • {name}")
+        print("\n请在 config/config.yaml 中设置：")
+        print(f"  gemini_model: \"{available[0]}\"")
+    else:
+        print("❌ 没有可用的模型，请检查 API Key 和网络连接")
+    print("=" * 60)
+
+    return bool(available)
+
+
+def main():
+    """主函数"""
+    success = test_gemini_models()
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())